@@ -92,7 +92,14 @@ def data_shape_from_header(header):
     return shape
 
 
-_dtype_to_mode = dict(f2=12, f4=2, i1=0, i2=1, u1=6, u2=6, c8=4)
+# Keyed on the dtype's type number, which is the same for either byte order
+_dtype_to_mode = { np.dtype(np.float16).num: 12,
+                   np.dtype(np.float32).num: 2,
+                   np.dtype(np.int8).num: 0,
+                   np.dtype(np.int16).num: 1,
+                   np.dtype(np.uint8).num: 6,
+                   np.dtype(np.uint16).num: 6,
+                   np.dtype(np.complex64).num: 4 }
 
 def mode_from_dtype(dtype):
     """Return the MRC mode number corresponding to the given :class:`numpy
@@ -120,19 +127,18 @@ def mode_from_dtype(dtype):
         :exc:`ValueError`: If there is no corresponding MRC mode for the given
             dtype.
     """
-    kind_and_size = dtype.kind + str(dtype.itemsize)
-    if kind_and_size in _dtype_to_mode:
-        return _dtype_to_mode[kind_and_size]
+    if dtype.num in _dtype_to_mode:
+        return _dtype_to_mode[dtype.num]
     raise ValueError("dtype '{0}' cannot be converted "
                      "to an MRC file mode".format(dtype))
 
 
-_mode_to_dtype = { 0: np.int8,
-                   1: np.int16,
-                   2: np.float32,
-                   4: np.complex64,
-                   6: np.uint16,
-                   12: np.float16 }
+_mode_to_dtype = { 0: np.dtype(np.int8),
+                   1: np.dtype(np.int16),
+                   2: np.dtype(np.float32),
+                   4: np.dtype(np.complex64),
+                   6: np.dtype(np.uint16),
+                   12: np.dtype(np.float16) }
 
 def dtype_from_mode(mode):
     """Return the :class:`numpy dtype <numpy.dtype>` corresponding to the given
@@ -171,7 +177,7 @@ def dtype_from_mode(mode):
             raise ValueError("Mode array should contain exactly one item")
         mode = mode.item()
     if mode in _mode_to_dtype:
-        return np.dtype(_mode_to_dtype[mode])
+        return _mode_to_dtype[mode]
     else:
         raise ValueError("Unrecognised mode '{0}'".format(mode))
 
@@ -245,6 +251,10 @@ def byte_orders_equal(a, b):
     """
     return normalise_byte_order(a) == normalise_byte_order(b)
 
+_normalised_byte_orders = {'<': '<',
+                           '>': '>',
+                           '=': '<' if sys.byteorder == 'little' else '>'}
+
 def normalise_byte_order(byte_order):
     """Convert a numpy byte order indicator to one of ``<`` or ``>``.
     
@@ -261,12 +271,15 @@ def normalise_byte_order(byte_order):
         :exc:`ValueError`: If ``byte_order`` is not one of ``=``, ``<`` or
             ``>``.
     """
-    if byte_order not in ('<', '>', '='):
+    try:
+        normalised = _normalised_byte_orders.get(byte_order)
+    except TypeError:
+        # Unhashable input, such as a list, cannot be a byte order indicator
+        normalised = None
+    if normalised is None:
         raise ValueError("Unrecognised byte order indicator '{0}'"
                          .format(byte_order))
-    if byte_order == '=':
-        return '<' if sys.byteorder == 'little' else '>'
-    return byte_order
+    return normalised
 
 def spacegroup_is_volume_stack(ispg):
     """Identify if the given space group number represents a volume stack.
@@ -297,13 +310,16 @@ def is_printable_ascii(string_):
             return False
 
 
+# All byte values which are not printable ASCII characters, for use with
+# bytes.translate()
+_unprintable_bytes = bytes(bytearray(b for b in range(256)
+                                     if chr(b) not in printable_chars))
+
+
 def printable_string_from_bytes(bytes_):
     """Convert bytes into a printable ASCII string by removing non-printable characters.
     """
-    string_ = bytes.decode(bytes_, encoding='ascii', errors='ignore')
-    if not is_printable_ascii(string_):
-        string_ = "".join(list(s for s in string_ if is_printable_ascii(s)))
-    return string_
+    return bytes_.translate(None, _unprintable_bytes).decode('ascii')
 
 
 def bytes_from_string(string_):
@@ -9,9 +9,33 @@ Module to provide helper utilities for mrcfile tests.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import atexit
 import os
+import shutil
+import sys
+import tempfile
+import threading
 import unittest
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # Python 2
+
+import numpy as np
+
+
+# Put test output on a RAM-backed file system if there is one, to avoid disk
+# I/O in tests which write files. The MRCFILE_TESTTMP environment variable can
+# be used to choose a different directory (for example a RAM disk on systems
+# other than Linux).
+if os.environ.get('MRCFILE_TESTTMP'):
+    TEMP_DIR_ROOT = os.environ['MRCFILE_TESTTMP']
+elif os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+    TEMP_DIR_ROOT = '/dev/shm'
+else:
+    TEMP_DIR_ROOT = None  # use the default temporary directory
+
 
 def get_test_data_path():
     """ Get the path to the test data directory.
@@ -22,6 +46,81 @@ def get_test_data_path():
     return os.path.join(os.path.dirname(__file__), 'test_data')
 
 
+def make_temp_dir():
+    """Make a new temporary directory for test output and return its path.
+    
+    The directory is created under :data:`TEMP_DIR_ROOT`. The caller is
+    responsible for removing it.
+    """
+    return tempfile.mkdtemp(dir=TEMP_DIR_ROOT)
+
+
+# Temporary directories are normally removed as soon as a test has finished
+# with them. Set MRCFILE_TEST_ASYNC_CLEANUP to remove them on a background
+# thread instead, so tests do not have to wait for a slow file system.
+_cleanup_queue = queue.Queue()
+_cleanup_thread = None
+_cleanup_lock = threading.Lock()
+
+
+def _cleanup_worker():
+    while True:
+        path = _cleanup_queue.get()
+        if path is None:
+            break
+        try:
+            shutil.rmtree(path)
+        except Exception as ex:
+            # Report the failure on the real stderr, since tests may have
+            # replaced sys.stderr to check their own output
+            print("Could not remove temporary test output {0}: {1}"
+                  .format(path, ex), file=sys.__stderr__)
+
+
+def _finish_cleanup():
+    """Wait for all queued directories to be removed."""
+    _cleanup_queue.put(None)
+    _cleanup_thread.join()
+
+
+def remove_temp_dir(path):
+    """Remove a temporary directory made by :func:`make_temp_dir`."""
+    global _cleanup_thread
+    if not os.environ.get('MRCFILE_TEST_ASYNC_CLEANUP'):
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        return
+    with _cleanup_lock:
+        if _cleanup_thread is None:
+            _cleanup_thread = threading.Thread(target=_cleanup_worker)
+            _cleanup_thread.daemon = True
+            _cleanup_thread.start()
+            atexit.register(_finish_cleanup)
+    _cleanup_queue.put(path)
+
+
+def assert_array_bytes_equal(expected, actual, msg=None):
+    """Assert that two arrays have the same dtype, shape and raw contents.
+    
+    This compares the arrays' bytes directly, which is faster than an
+    element-wise comparison. If the contents differ,
+    :func:`numpy.testing.assert_array_equal` is used to give a more helpful
+    error message. If ``msg`` is given, it is included in any failure
+    message to identify the arrays being compared.
+    """
+    prefix = '' if msg is None else '{0}: '.format(msg)
+    assert expected.dtype == actual.dtype, (
+        prefix + "dtypes differ: {0} != {1}".format(expected.dtype,
+                                                    actual.dtype))
+    assert expected.shape == actual.shape, (
+        prefix + "shapes differ: {0} != {1}".format(expected.shape,
+                                                    actual.shape))
+    if expected.tobytes() != actual.tobytes():
+        np.testing.assert_array_equal(expected, actual,
+                                      err_msg='' if msg is None else msg)
+        raise AssertionError(prefix + "Array contents differ")
+
+
 class AssertRaisesRegexMixin(object):
     
     """Mixin to ensure test cases can call assertRaisesRegex in Python 2 and 3.
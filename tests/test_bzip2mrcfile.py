@@ -37,13 +37,15 @@ class Bzip2MrcFileTest(test_mrcfile.MrcFileTest):
         
         # Set the newmrc method to the GzipMrcFile constructor
         self.newmrc = Bzip2MrcFile
-        
-        # Set up parameters so MrcObject tests run on the GzipMrcFile class
+    
+    def create_mrcobject(self):
+        """Override to run the MrcObject tests on the Bzip2MrcFile class."""
         obj_mrc_name = os.path.join(self.test_output, 'test_mrcobject.mrc')
-        self.mrcobject = Bzip2MrcFile(obj_mrc_name, 'w+', overwrite=True)
+        mrcobject = Bzip2MrcFile(obj_mrc_name, 'w+')
         # Flush and re-read to ensure underlying file is valid bzip2
-        self.mrcobject.flush()
-        self.mrcobject._read()
+        mrcobject.flush()
+        mrcobject._read()
+        return mrcobject
     
     def test_non_mrc_file_is_rejected(self):
         """Override test to change expected error message."""
@@ -59,7 +61,7 @@ class Bzip2MrcFileTest(test_mrcfile.MrcFileTest):
     
     def test_repr(self):
         """Override test to change expected repr string."""
-        with Bzip2MrcFile(self.example_mrc_name) as mrc:
+        with Bzip2MrcFile(self.example_mrc_name, header_only=True) as mrc:
             assert repr(mrc) == "Bzip2MrcFile('{0}', mode='r')".format(self.example_mrc_name)
 
 
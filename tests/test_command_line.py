@@ -11,9 +11,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import io
 import os
-import shutil
 import sys
-import tempfile
 import unittest
 
 from mrcfile import command_line, validator
@@ -31,7 +29,6 @@ class CommandLineTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         
         # Set up test files and names to be used
         self.test_data = helpers.get_test_data_path()
-        self.test_output = tempfile.mkdtemp()
         
         self.files = [
             os.path.join(self.test_data, 'EMD-3197.map'),
@@ -52,9 +49,6 @@ class CommandLineTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         # Restore stdout and stderr
         sys.stdout = self.orig_stdout
         sys.stderr = self.orig_stderr
-        
-        if os.path.exists(self.test_output):
-            shutil.rmtree(self.test_output)
         super(CommandLineTest, self).tearDown()
 
     def test_print_header_no_args(self):
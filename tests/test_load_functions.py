@@ -10,9 +10,8 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os
-import shutil
+import re
 import sys
-import tempfile
 import unittest
 
 import numpy as np
@@ -32,6 +31,20 @@ except ImportError:
     except ImportError:
         pathlib_unavailable = True
 
+# Expected error messages, compiled once for use with assertRaisesRegex
+NO_SUCH_FILE_RE = re.compile("No such file")
+UNKNOWN_COMPRESSION_RE = re.compile('Unknown compression format')
+UNSUPPORTED_MODE_RE = re.compile("Mode 'z' not supported")
+NO_MAP_ID_RE = re.compile('Map ID string not found')
+ALREADY_EXISTS_RE = re.compile("already exists")
+CALL_NEW_RE = re.compile(r"call 'mrcfile\.new\(\)'")
+EXT_HEADER_TOO_LARGE_RE = re.compile("extended header is too large")
+SHAPE_TOO_LARGE_RE = re.compile("shape is too large")
+
+# Shared test data, made read-only so no test can change it for the others
+UINT16_24 = np.arange(24, dtype=np.uint16)
+UINT16_24.flags.writeable = False
+
 
 class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
     
@@ -44,7 +57,7 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         
         # Set up test files and names to be used
         self.test_data = helpers.get_test_data_path()
-        self.test_output = tempfile.mkdtemp()
+        self.test_output = helpers.make_temp_dir()
         self.temp_mrc_name = os.path.join(self.test_output, 'test_mrcfile.mrc')
         self.temp_gz_mrc_name = self.temp_mrc_name + '.gz'
         self.example_mrc_name = os.path.join(self.test_data, 'EMD-3197.map')
@@ -53,8 +66,7 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         self.slow_mrc_name = os.path.join(self.test_data, 'fei-extended.mrc.gz')
     
     def tearDown(self):
-        if os.path.exists(self.test_output):
-            shutil.rmtree(self.test_output)
+        helpers.remove_temp_dir(self.test_output)
         super(LoadFunctionTest, self).tearDown()
     
     def test_normal_opening(self):
@@ -108,7 +120,7 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert not os.path.exists(temp_mrc_name_str)
         open(temp_mrc_name_str, 'w+').close()
         assert os.path.exists(temp_mrc_name_str)
-        with self.assertRaisesRegex(ValueError, r"call 'mrcfile\.new\(\)'"):
+        with self.assertRaisesRegex(ValueError, CALL_NEW_RE):
             mrcfile.open(self.temp_mrc_name, mode='w+')
 
     def test_header_only_opening(self):
@@ -117,56 +129,68 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
             assert mrc.extended_header is not None
             assert mrc.data is None
     
-    def test_opening_nonexistent_file(self):
-        with self.assertRaisesRegex(Exception, "No such file"):
-            mrcfile.open('no_file')
-    
     def test_new_file_with_data(self):
-        data = np.arange(24, dtype=np.uint16).reshape(2, 3, 4)
+        data = UINT16_24.reshape(2, 3, 4)
         with mrcfile.new(self.temp_mrc_name, data) as mrc:
             np.testing.assert_array_equal(data, mrc.data)
     
+    def test_new_mmap_file_with_data_written_through_memmap(self):
+        data = UINT16_24.reshape(2, 3, 4)
+        with mrcfile.new_mmap(self.temp_mrc_name, data.shape, mrc_mode=6) as mrc:
+            data_offset = mrc.header.nbytes + mrc.extended_header.nbytes
+        # Write the data straight into the file's data block
+        mm = np.memmap(str(self.temp_mrc_name), dtype=np.uint16, mode='r+',
+                       offset=data_offset, shape=data.shape)
+        mm[:] = data
+        mm.flush()
+        del mm
+        with mrcfile.open(self.temp_mrc_name) as mrc:
+            np.testing.assert_array_equal(data, mrc.data)
+    
     def test_new_gzip_file(self):
-        data = np.arange(24, dtype=np.uint16).reshape(4, 3, 2)
+        data = UINT16_24.reshape(4, 3, 2)
         with mrcfile.new(self.temp_mrc_name, data, compression='gzip') as mrc:
             np.testing.assert_array_equal(data, mrc.data)
             assert repr(mrc) == ("GzipMrcFile('{0}', mode='w+')"
                                  .format(self.temp_mrc_name))
     
     def test_new_bzip2_file(self):
-        data = np.arange(24, dtype=np.uint16).reshape(4, 3, 2)
+        data = UINT16_24.reshape(4, 3, 2)
         with mrcfile.new(self.temp_mrc_name, data, compression='bzip2') as mrc:
             np.testing.assert_array_equal(data, mrc.data)
             assert repr(mrc) == ("Bzip2MrcFile('{0}', mode='w+')"
                                  .format(self.temp_mrc_name))
     
-    def test_unknown_compression_type(self):
-        with self.assertRaisesRegex(ValueError, 'Unknown compression format'):
-            mrcfile.new(self.temp_mrc_name, compression='other')
-    
     def test_overwriting_flag(self):
         assert not os.path.exists(str(self.temp_mrc_name))
         open(str(self.temp_mrc_name), 'w+').close()
         assert os.path.exists(str(self.temp_mrc_name))
-        with self.assertRaisesRegex(ValueError, "already exists"):
+        with self.assertRaisesRegex(ValueError, ALREADY_EXISTS_RE):
             mrcfile.new(self.temp_mrc_name)
-        with self.assertRaisesRegex(ValueError, "already exists"):
+        with self.assertRaisesRegex(ValueError, ALREADY_EXISTS_RE):
             mrcfile.new(self.temp_mrc_name, overwrite=False)
         mrcfile.new(self.temp_mrc_name, overwrite=True).close()
     
-    def test_invalid_mode_raises_exception(self):
-        with self.assertRaisesRegex(ValueError, "Mode 'z' not supported"):
-            mrcfile.open(self.example_mrc_name, mode='z')
-    
-    def test_non_mrc_file_raises_exception(self):
-        name = os.path.join(self.test_data, 'emd_3197.png')
-        with self.assertRaisesRegex(ValueError, 'Map ID string not found'):
-            mrcfile.open(name)
-    
-    def test_gzipped_non_mrc_file_raises_exception(self):
-        name = os.path.join(self.test_data, 'emd_3197.png.gz')
-        with self.assertRaisesRegex(ValueError, 'Map ID string not found'):
-            mrcfile.open(name)
+    def test_error_conditions(self):
+        png_name = os.path.join(self.test_data, 'emd_3197.png')
+        png_gz_name = os.path.join(self.test_data, 'emd_3197.png.gz')
+        cases = [
+            ('open missing file', lambda: mrcfile.open('no_file'),
+             Exception, NO_SUCH_FILE_RE),
+            ('new with unknown compression',
+             lambda: mrcfile.new(self.temp_mrc_name, compression='other'),
+             ValueError, UNKNOWN_COMPRESSION_RE),
+            ("open in mode 'z'",
+             lambda: mrcfile.open(self.example_mrc_name, mode='z'),
+             ValueError, UNSUPPORTED_MODE_RE),
+            ('open png file', lambda: mrcfile.open(png_name),
+             ValueError, NO_MAP_ID_RE),
+            ('open png.gz file', lambda: mrcfile.open(png_gz_name),
+             ValueError, NO_MAP_ID_RE),
+        ]
+        for label, call, exception, regex in cases:
+            with self.assertRaisesRegex(exception, regex, msg=label):
+                call()
     
     def test_error_in_gzip_opening_raises_new_exception(self):
         # Tricky to test this case. Easiest to monkey-patch GzipMrcFile.__init__
@@ -229,7 +253,8 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
             assert repr(mrc) == ("MrcMemmap('{0}', mode='w+')"
                                  .format(self.temp_mrc_name))
             assert mrc.data.shape == (3, 4, 5, 6)
-            assert np.all(mrc.data == 1.1)
+            assert mrc.data.dtype == np.float32
+            assert np.all(mrc.data == np.float32(1.1))
             assert mrc.header.nx == 6
             file_size = mrc._iostream.tell() # relies on flush() leaving stream at end
             assert file_size == mrc.header.nbytes + mrc.data.nbytes
@@ -256,7 +281,7 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
     @unittest.skipIf(sys.maxsize <= np.iinfo(np.int32).max, "can't run test on 32-bit")
     def test_new_mmap_with_extended_header_too_big(self):
         ext = np.empty((int(np.iinfo(np.int32).max) + 1,), dtype='V1')
-        with self.assertRaisesRegex(ValueError, "extended header is too large"):
+        with self.assertRaisesRegex(ValueError, EXT_HEADER_TOO_LARGE_RE):
             mrcfile.new_mmap(self.temp_mrc_name,
                              (3, 4, 5, 6),
                              mrc_mode=2,
@@ -264,7 +289,7 @@ class LoadFunctionTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
                              extended_header=ext)
 
     def test_new_mmap_with_shape_too_big(self):
-        with self.assertRaisesRegex(ValueError, "shape is too large"):
+        with self.assertRaisesRegex(ValueError, SHAPE_TOO_LARGE_RE):
             mrcfile.new_mmap(self.temp_mrc_name,
                              (np.iinfo(np.int32).max + 1, 1))
 
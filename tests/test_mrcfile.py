@@ -10,6 +10,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os
+import re
 import shutil
 import sys
 import tempfile
@@ -38,6 +39,37 @@ except ImportError:
     except ImportError:
         pathlib_unavailable = True
 
+# Expected error messages, compiled once for use with assertRaisesRegex
+NO_MAP_ID_RE = re.compile('Map ID string not found')
+READ_ONLY_RE = re.compile('read-only')
+NO_SUCH_FILE_RE = re.compile("No such file")
+UNRECOGNISED_MODE_RE = re.compile("Unrecognised mode")
+UNSUPPORTED_MODE_RE = re.compile("Mode '.+' not supported")
+ALREADY_EXISTS_RE = re.compile("already exists")
+
+# Test images, built once and made read-only. Tests take copies (in the byte
+# order they need) or build new arrays from them rather than calling
+# np.linspace() every time.
+INT8_IMAGE = np.linspace(-128, 127, 90, dtype=np.int8).reshape(9, 10)
+INT8_IMAGE.flags.writeable = False
+INT16_IMAGE = np.linspace(-32768, 32767, 90, dtype=np.int16).reshape(9, 10)
+INT16_IMAGE.flags.writeable = False
+UINT16_IMAGE = np.linspace(0, 65535, 90, dtype=np.uint16).reshape(9, 10)
+UINT16_IMAGE.flags.writeable = False
+FLOAT32_IMAGE = np.linspace(-1e6, 1e6, 90, dtype=np.float32).reshape(9, 10)
+FLOAT32_IMAGE.flags.writeable = False
+
+# Small int16 array used by many tests. set_data() only reads its argument, so
+# tests can pass this in directly.
+INT16_3X4 = np.arange(12, dtype=np.int16).reshape(3, 4)
+INT16_3X4.flags.writeable = False
+
+# Small read-only arrays for tests which just need something to pass in
+EMPTY_ARRAY = np.array(())
+EMPTY_ARRAY.flags.writeable = False
+ZEROS_5 = np.zeros(5)
+ZEROS_5.flags.writeable = False
+
 
 # Doctest stuff commented out for now - would be nice to get it working!
 # import doctest
@@ -67,31 +99,85 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
     """
 
+    @classmethod
+    def setUpClass(cls):
+        super(MrcFileTest, cls).setUpClass()
+
+        # Names of the read-only example files. These are the same for every
+        # test so are only worked out once (subclasses can still replace them
+        # in setUp())
+        cls.test_data = helpers.get_test_data_path()
+        cls.example_mrc_name = os.path.join(cls.test_data, 'EMD-3197.map')
+        cls.ext_header_mrc_name = os.path.join(cls.test_data, 'EMD-3001.map')
+        cls.fei1_ext_header_mrc_name = os.path.join(cls.test_data, 'fei-extended.mrc')
+        cls.fei2_ext_header_mrc_name = os.path.join(cls.test_data, 'epu2.9_example.mrc')
+
+        # One temporary directory for the class, with a subdirectory per test
+        cls.class_output = helpers.make_temp_dir()
+
+        # Small file shared by tests which only need something valid to open.
+        # It is written on first use by small_int16_file()
+        cls._small_int16_mrc_name = None
+
+    @classmethod
+    def tearDownClass(cls):
+        helpers.remove_temp_dir(cls.class_output)
+        super(MrcFileTest, cls).tearDownClass()
+
     def setUp(self):
         super(MrcFileTest, self).setUp()
 
-        # Set up test files and names to be used
-        self.test_data = helpers.get_test_data_path()
-        self.test_output = tempfile.mkdtemp()
-        self.temp_mrc_name = os.path.join(self.test_output, 'test_mrcfile.mrc')
-        self.example_mrc_name = os.path.join(self.test_data, 'EMD-3197.map')
-        self.ext_header_mrc_name = os.path.join(self.test_data, 'EMD-3001.map')
-        self.fei1_ext_header_mrc_name = os.path.join(self.test_data, 'fei-extended.mrc')
-        self.fei2_ext_header_mrc_name = os.path.join(self.test_data, 'epu2.9_example.mrc')
+        # The test's output directory is only created (by the test_output
+        # property) if the test writes any files
+        self._test_output = None
 
         # Set newmrc method as MrcFile constructor, to allow override by subclasses
         self.newmrc = MrcFile
 
-        # Set up parameters so MrcObject tests run on the MrcFile class
-        obj_mrc_name = os.path.join(self.test_output, 'test_mrcobject.mrc')
-        self.mrcobject = MrcFile(obj_mrc_name, 'w+')
-
     def tearDown(self):
-        self.mrcobject.close()
-        if os.path.exists(self.test_output):
-            shutil.rmtree(self.test_output)
+        if self._mrcobject is not None:
+            self._mrcobject.close()
+        if self._test_output is not None:
+            helpers.remove_temp_dir(self._test_output)
         super(MrcFileTest, self).tearDown()
 
+    @property
+    def test_output(self):
+        """A new directory for files written by the test."""
+        if self._test_output is None:
+            self._test_output = tempfile.mkdtemp(prefix=self._testMethodName,
+                                                 dir=self.class_output)
+        return self._test_output
+
+    @property
+    def temp_mrc_name(self):
+        return os.path.join(self.test_output, 'test_mrcfile.mrc')
+
+    def create_mrcobject(self):
+        """Create the object to be used by the inherited MrcObject tests.
+
+        The MrcObject tests run on an MrcFile instead. Subclasses should
+        override this to test their own MrcFile type.
+        """
+        obj_mrc_name = os.path.join(self.test_output, 'test_mrcobject.mrc')
+        return MrcFile(obj_mrc_name, 'w+')
+
+    def small_int16_file(self):
+        """Get the name of a small file containing a 3 x 4 array of int16
+        values from 0 to 11.
+
+        The file is written with self.newmrc the first time this is called in
+        each test class, and then shared. Tests must not change it: tests which
+        need to open it in ``r+`` mode should copy it first.
+        """
+        cls = type(self)
+        if cls._small_int16_mrc_name is None:
+            name = os.path.join(cls.class_output, 'small_int16.mrc')
+            with self.newmrc(name, mode='w+') as mrc:
+                mrc.set_data(INT16_3X4)
+            cls._small_int16_mrc_name = name
+        return cls._small_int16_mrc_name
+
     ############################################################################
     #
     # Tests which depend on existing files (in the test_data directory)
@@ -109,7 +195,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
     def test_non_mrc_file_is_rejected(self):
         name = os.path.join(self.test_data, 'emd_3197.png')
-        with (self.assertRaisesRegex(ValueError, 'Map ID string not found')):
+        with (self.assertRaisesRegex(ValueError, NO_MAP_ID_RE)):
             self.newmrc(name)
 
     def test_non_mrc_file_gives_correct_warnings_in_permissive_mode(self):
@@ -127,36 +213,30 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert "Unrecognised mode" in str(w[3].message)
 
     def test_repr(self):
-        with self.newmrc(self.example_mrc_name) as mrc:
+        with self.newmrc(self.example_mrc_name, header_only=True) as mrc:
             expected = "MrcFile('{0}', mode='r')".format(self.example_mrc_name)
             assert repr(mrc) == expected
 
     def test_data_values_are_correct(self):
         with self.newmrc(self.example_mrc_name) as mrc:
-            # Check a few values
-            self.assertAlmostEqual(mrc.data[0, 0, 0], -1.8013091)
-            self.assertAlmostEqual(mrc.data[9, 6, 13], 4.6207790)
-            self.assertAlmostEqual(mrc.data[9, 6, 14], 5.0373931)
-            self.assertAlmostEqual(mrc.data[-1, -1, -1], 1.3078574)
-
             # Calculate some statistics for all values
-            calc_max = mrc.data.max()
-            calc_min = mrc.data.min()
-            calc_mean = mrc.data.mean(dtype=np.float64)
-            calc_std = mrc.data.std()
-            calc_sum = mrc.data.sum()
-
-            # Compare calculated values with header records
-            self.assertAlmostEqual(calc_max, mrc.header.dmax)
-            self.assertAlmostEqual(calc_min, mrc.header.dmin)
-            self.assertAlmostEqual(calc_mean, mrc.header.dmean)
-            self.assertAlmostEqual(calc_std, mrc.header.rms)
+            calc_min, calc_max, calc_mean, calc_std, calc_sum = calculate_stats(mrc.data)
+
+            # Check a few values, and compare the calculated statistics with
+            # the header records (to 7 decimal places, like assertAlmostEqual)
+            indices = ([0, 9, 9, -1], [0, 6, 6, -1], [0, 13, 14, -1])
+            actual = np.concatenate((mrc.data[indices],
+                                     [calc_max, calc_min, calc_mean, calc_std]))
+            expected = [-1.8013091, 4.6207790, 5.0373931, 1.3078574,
+                        mrc.header.dmax, mrc.header.dmin, mrc.header.dmean,
+                        mrc.header.rms]
+            np.testing.assert_allclose(actual, expected, rtol=0, atol=5e-8)
 
             # Convert calc_sum to float to fix a bug with memmap comparisons in python 3
             self.assertAlmostEqual(float(calc_sum), 6268.896, places=3)
 
     def test_absent_extended_header_is_read_as_zero_length_array(self):
-        with self.newmrc(self.example_mrc_name) as mrc:
+        with self.newmrc(self.example_mrc_name, header_only=True) as mrc:
             assert mrc.header.nbytes == 1024
             assert mrc.header.nsymbt == 0
             assert mrc.extended_header.nbytes == 0
@@ -164,20 +244,19 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert mrc.extended_header.tobytes() == b''
 
     def test_extended_header_is_read_correctly(self):
-        with self.newmrc(self.ext_header_mrc_name) as mrc:
+        with self.newmrc(self.ext_header_mrc_name, header_only=True) as mrc:
             assert mrc.header.nbytes == 1024
             assert mrc.header.nsymbt == 160
             assert mrc.extended_header.nbytes == 160
             assert mrc.extended_header.dtype.kind == 'V'
-            mrc.extended_header.dtype = 'S80'
-            ext = mrc.extended_header
+            ext = mrc.extended_header.view('S80')
             assert ext[0] == (b'X,  Y,  Z                               '
                               b'                                        ')
             assert ext[1] == (b'-X,  Y+1/2,  -Z                         '
                               b'                                        ')
 
     def test_indexed_extended_header_from_FEI1_file(self):
-        with self.newmrc(self.fei1_ext_header_mrc_name) as mrc:
+        with self.newmrc(self.fei1_ext_header_mrc_name, header_only=True) as mrc:
             # FEI1 means use the fei format
             assert mrc.header['exttyp'] == b'FEI1'
             assert mrc.header.nversion == 20140
@@ -196,7 +275,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert ext[0]['HT'] == 300000.0
 
     def test_indexed_extended_header_from_FEI2_file(self):
-        with self.newmrc(self.fei2_ext_header_mrc_name) as mrc:
+        with self.newmrc(self.fei2_ext_header_mrc_name, header_only=True) as mrc:
             # FEI2 means use the fei format
             assert mrc.header['exttyp'] == b'FEI2'
             assert mrc.header.nversion == 20140
@@ -219,17 +298,17 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
     def test_cannot_edit_extended_header_in_read_only_mode(self):
         with self.newmrc(self.ext_header_mrc_name, mode='r') as mrc:
             assert not mrc.extended_header.flags.writeable
-            with self.assertRaisesRegex(ValueError, 'read-only'):
+            with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
                 mrc.extended_header.fill(b'a')
 
     def test_cannot_set_extended_header_in_read_only_mode(self):
         with self.newmrc(self.example_mrc_name, mode='r') as mrc:
             assert not mrc.extended_header.flags.writeable
-            with self.assertRaisesRegex(ValueError, 'read-only'):
-                mrc.set_extended_header(np.zeros(5))
+            with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
+                mrc.set_extended_header(ZEROS_5)
 
     def test_voxel_size_is_read_correctly(self):
-        with self.newmrc(self.example_mrc_name) as mrc:
+        with self.newmrc(self.example_mrc_name, header_only=True) as mrc:
             self.assertAlmostEqual(mrc.voxel_size.x, 11.400000, places=6)
             self.assertAlmostEqual(mrc.voxel_size.y, 11.400000, places=6)
             self.assertAlmostEqual(mrc.voxel_size.z, 11.400000, places=6)
@@ -238,7 +317,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
         with self.newmrc(self.example_mrc_name) as mrc:
             orig_data = mrc.data.copy()
             mrc._read()
-            np.testing.assert_array_equal(orig_data, mrc.data)
+            helpers.assert_array_bytes_equal(orig_data, mrc.data)
 
     @unittest.skipIf(pathlib_unavailable, "pathlib not available")
     def test_opening_with_pathlib(self):
@@ -252,41 +331,41 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
     #
 
     def test_opening_nonexistent_file(self):
-        with self.assertRaisesRegex(Exception, "No such file"):
+        with self.assertRaisesRegex(Exception, NO_SUCH_FILE_RE):
             self.newmrc('no_file')
 
     def test_opening_file_with_unknown_mode(self):
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.header.mode = 10
-        with self.assertRaisesRegex(ValueError, "Unrecognised mode"):
+        with self.assertRaisesRegex(ValueError, UNRECOGNISED_MODE_RE):
             self.newmrc(self.temp_mrc_name)
 
     def test_can_read_and_flush_stream_repeatedly(self):
-        orig_data = np.arange(12, dtype=np.int16).reshape(3, 4)
+        orig_data = INT16_3X4
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.set_data(orig_data.copy())
             mrc.flush()
-            np.testing.assert_array_equal(orig_data, mrc.data)
+            helpers.assert_array_bytes_equal(orig_data, mrc.data)
             mrc._read()
-            np.testing.assert_array_equal(orig_data, mrc.data)
+            helpers.assert_array_bytes_equal(orig_data, mrc.data)
             mrc._read()
             mrc.flush()
             mrc.flush()
             mrc._read()
             mrc._read()
             mrc.flush()
-            np.testing.assert_array_equal(orig_data, mrc.data)
+            helpers.assert_array_bytes_equal(orig_data, mrc.data)
 
     def test_cannot_use_invalid_file_modes(self):
         for mode in ('w', 'a', 'a+'):
-            with self.assertRaisesRegex(ValueError, "Mode '.+' not supported"):
+            with self.assertRaisesRegex(ValueError, UNSUPPORTED_MODE_RE):
                 self.newmrc(self.temp_mrc_name, mode=mode)
 
     def test_cannot_accidentally_overwrite_file(self):
         assert not os.path.exists(self.temp_mrc_name)
         open(self.temp_mrc_name, 'w+').close()
         assert os.path.exists(self.temp_mrc_name)
-        with self.assertRaisesRegex(ValueError, "already exists"):
+        with self.assertRaisesRegex(ValueError, ALREADY_EXISTS_RE):
             self.newmrc(self.temp_mrc_name, mode='w+')
 
     def test_can_deliberately_overwrite_file(self):
@@ -297,13 +376,14 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
     def test_warning_issued_if_file_is_too_large(self):
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
+            mrc.set_data(INT16_3X4)
             # Call internal _set_new_data() method to add an extra row of data
             # without updating the header
             mrc._set_new_data(np.arange(16, dtype=np.int16).reshape(4, 4))
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter("always")
-            self.newmrc(self.temp_mrc_name)
+            with self.newmrc(self.temp_mrc_name):
+                pass
             assert len(w) == 1
             assert issubclass(w[0].category, RuntimeWarning)
             assert "file is 8 bytes larger than expected" in str(w[0].message)
@@ -364,8 +444,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert len(w) == 1
 
     def test_can_edit_header_in_read_write_mode(self):
-        with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
+        shutil.copy(self.small_int16_file(), self.temp_mrc_name)
         with self.newmrc(self.temp_mrc_name, mode='r+') as mrc:
             assert mrc.header.ispg == 0
             assert mrc.header.flags.writeable
@@ -373,44 +452,43 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert mrc.header.ispg == 1
 
     def test_cannot_edit_header_in_read_only_mode(self):
-        with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
-        with self.newmrc(self.temp_mrc_name, mode='r') as mrc:
+        name = self.small_int16_file()
+        with self.newmrc(name, mode='r') as mrc:
             assert mrc.header.ispg == 0
             assert not mrc.header.flags.writeable
-            with self.assertRaisesRegex(ValueError, 'read-only'):
+            with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
                 mrc.header.ispg = 1
-        with self.newmrc(self.temp_mrc_name, mode='r') as mrc:
+        with self.newmrc(name, mode='r') as mrc:
             assert mrc.header.ispg == 0
 
     def test_creating_extended_header(self):
-        data = np.arange(12, dtype=np.int16).reshape(3, 4)
+        data = INT16_3X4
         extended_header = np.array('example extended header', dtype='S')
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.set_data(data)
             mrc.set_extended_header(extended_header)
             np.testing.assert_array_equal(mrc.data, data)
         with self.newmrc(self.temp_mrc_name, mode='r') as mrc:
-            # Change the extended header dtype to a string for comparison
-            mrc.extended_header.dtype = 'S{}'.format(mrc.extended_header.nbytes)
-            np.testing.assert_array_equal(mrc.extended_header, extended_header)
+            # View the extended header as a string for comparison
+            ext = mrc.extended_header.view('S{}'.format(mrc.extended_header.nbytes))
+            np.testing.assert_array_equal(ext, extended_header)
             np.testing.assert_array_equal(mrc.data, data)
 
     def test_removing_extended_header(self):
-        data = np.arange(12, dtype=np.int16).reshape(3, 4)
+        data = INT16_3X4
         extended_header = np.array('example extended header', dtype='S')
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.set_data(data)
             mrc.set_extended_header(extended_header)
         with self.newmrc(self.temp_mrc_name, mode='r+') as mrc:
-            mrc.set_extended_header(np.array(()))
+            mrc.set_extended_header(EMPTY_ARRAY)
             mrc.flush()
             assert mrc.header.nsymbt == 0
             file_size = mrc._iostream.tell() # relies on flush() leaving stream at end
             assert file_size == mrc.header.nbytes + mrc.data.nbytes
 
     def test_extended_header_with_incorrect_type(self):
-        data = np.arange(12, dtype=np.int16).reshape(3, 4)
+        data = INT16_3X4
         extended_header = np.array('example extended header', dtype='S')
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.set_data(data)
@@ -422,15 +500,14 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
                 # Test that the file is still read, and the dtype falls back to 'V'
                 assert mrc.extended_header.dtype.kind == 'V'
                 assert mrc.indexed_extended_header is None
-                mrc.extended_header.dtype = 'S{}'.format(mrc.extended_header.nbytes)
-                np.testing.assert_array_equal(mrc.extended_header, extended_header)
+                ext = mrc.extended_header.view('S{}'.format(mrc.extended_header.nbytes))
+                np.testing.assert_array_equal(ext, extended_header)
             assert len(w) == 1
             assert "FEI1" in str(w[0].message)
             assert "extended header" in str(w[0].message)
 
     def test_can_edit_data_in_read_write_mode(self):
-        with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
+        shutil.copy(self.small_int16_file(), self.temp_mrc_name)
         with self.newmrc(self.temp_mrc_name, mode='r+') as mrc:
             assert mrc.data[1,1] == 5
             assert mrc.data.flags.writeable
@@ -438,25 +515,23 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert mrc.data[1,1] == 0
 
     def test_cannot_edit_data_in_read_only_mode(self):
-        with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
-        with self.newmrc(self.temp_mrc_name, mode='r') as mrc:
+        name = self.small_int16_file()
+        with self.newmrc(name, mode='r') as mrc:
             assert mrc.data[1,1] == 5
             assert not mrc.data.flags.writeable
-            with self.assertRaisesRegex(ValueError, 'read-only'):
+            with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
                 mrc.data[1,1] = 0
 
     def test_header_only_mode_does_not_read_data(self):
-        with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
-            mrc.set_data(np.arange(12, dtype=np.int16).reshape(3, 4))
-        with self.newmrc(self.temp_mrc_name, mode='r', header_only=True) as mrc:
+        name = self.small_int16_file()
+        with self.newmrc(name, mode='r', header_only=True) as mrc:
             assert mrc.header is not None
             assert mrc.extended_header is not None
             assert mrc.data is None
 
     def test_writing_image_mode_0(self):
         x, y = 10, 9
-        data = np.linspace(-128, 127, x * y, dtype=np.int8).reshape(y, x)
+        data = INT8_IMAGE.copy()
         name = os.path.join(self.test_output, 'test_img_10x9_mode0.mrc')
 
         # Write data
@@ -490,38 +565,25 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
         with self.newmrc(name, mode='w+') as mrc:
             mrc.set_data(data)
         with self.newmrc(name) as mrc:
-            np.testing.assert_array_equal(mrc.data, data)
-            assert mrc.data.dtype == data.dtype
-
-    def test_writing_image_mode_1_native_byte_order(self):
-        data = np.linspace(-32768, 32767, 90, dtype=np.int16).reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode1_native.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_1_little_endian(self):
-        data = np.linspace(-32768, 32767, 90, dtype='<i2').reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode1_le.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_1_big_endian(self):
-        data = np.linspace(-32768, 32767, 90, dtype='>i2').reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode1_be.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_2_native_byte_order(self):
-        data = create_test_float32_array()
-        name = os.path.join(self.test_output, 'test_img_10x9_mode2_native.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_2_little_endian(self):
-        data = create_test_float32_array(np.dtype('<f4'))
-        name = os.path.join(self.test_output, 'test_img_10x9_mode2_le.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_2_big_endian(self):
-        data = create_test_float32_array(np.dtype('>f4'))
-        name = os.path.join(self.test_output, 'test_img_10x9_mode2_be.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
+            helpers.assert_array_bytes_equal(data, mrc.data,
+                                             msg=os.path.basename(name))
+
+    def test_writing_image_modes_1_2_and_6_in_all_byte_orders(self):
+        cases = [
+            (INT16_IMAGE.copy(), 'test_img_10x9_mode1_native.mrc'),
+            (INT16_IMAGE.astype('<i2'), 'test_img_10x9_mode1_le.mrc'),
+            (INT16_IMAGE.astype('>i2'), 'test_img_10x9_mode1_be.mrc'),
+            (create_test_float32_array(), 'test_img_10x9_mode2_native.mrc'),
+            (create_test_float32_array(np.dtype('<f4')), 'test_img_10x9_mode2_le.mrc'),
+            (create_test_float32_array(np.dtype('>f4')), 'test_img_10x9_mode2_be.mrc'),
+            (np.linspace(0, 65535, 90, dtype=np.int16).reshape(9, 10),
+             'test_img_10x9_mode6_native.mrc'),
+            (UINT16_IMAGE.astype('<u2'), 'test_img_10x9_mode6_le.mrc'),
+            (UINT16_IMAGE.astype('>u2'), 'test_img_10x9_mode6_be.mrc'),
+        ]
+        for data, filename in cases:
+            name = os.path.join(self.test_output, filename)
+            self.write_file_then_read_and_assert_data_unchanged(name, data)
 
     def test_writing_image_mode_2_with_inf_and_nan(self):
         # Make an array of test data
@@ -553,29 +615,18 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert mrc.header.mode == 12
             assert mrc.data.dtype == np.float16
 
-    def test_writing_image_mode_4_native_byte_order(self):
-        data = create_test_complex64_array()
-        name = os.path.join(self.test_output, 'test_img_10x9_mode4_native.mrc')
+    def test_writing_image_mode_4_in_all_byte_orders(self):
+        cases = [
+            (create_test_complex64_array(), 'test_img_10x9_mode4_native.mrc'),
+            (create_test_complex64_array(np.dtype('<c8')), 'test_img_10x9_mode4_le.mrc'),
+            (create_test_complex64_array(np.dtype('>c8')), 'test_img_10x9_mode4_be.mrc'),
+        ]
         # Suppress complex casting warnings from statistics calculations
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", ComplexWarning)
-            self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_4_little_endian(self):
-        data = create_test_complex64_array().astype('<c8')
-        name = os.path.join(self.test_output, 'test_img_10x9_mode4_le.mrc')
-        # Suppress complex casting warnings from statistics calculations
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", ComplexWarning)
-            self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_4_big_endian(self):
-        data = create_test_complex64_array().astype('>c8')
-        name = os.path.join(self.test_output, 'test_img_10x9_mode4_be.mrc')
-        # Suppress complex casting warnings from statistics calculations
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", ComplexWarning)
-            self.write_file_then_read_and_assert_data_unchanged(name, data)
+            for data, filename in cases:
+                name = os.path.join(self.test_output, filename)
+                self.write_file_then_read_and_assert_data_unchanged(name, data)
 
     def test_writing_image_mode_4_with_inf_and_nan(self):
         # Make an array of test data
@@ -595,24 +646,9 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             warnings.simplefilter("ignore", RuntimeWarning)
             self.write_file_then_read_and_assert_data_unchanged(name, data)
 
-    def test_writing_image_mode_6_native_byte_order(self):
-        data = np.linspace(0, 65535, 90, dtype=np.int16).reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode6_native.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_6_little_endian(self):
-        data = np.linspace(0, 65535, 90, dtype='<u2').reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode6_le.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
-    def test_writing_image_mode_6_big_endian(self):
-        data = np.linspace(0, 65535, 90, dtype='>u2').reshape(9, 10)
-        name = os.path.join(self.test_output, 'test_img_10x9_mode6_be.mrc')
-        self.write_file_then_read_and_assert_data_unchanged(name, data)
-
     def test_writing_image_stack_mode_2_native_byte_order(self):
         x, y, z = 10, 9, 5
-        img = np.linspace(-1e6, 1e6, x * y, dtype=np.float32).reshape(y, x)
+        img = FLOAT32_IMAGE
         stack = np.arange(1, 6, dtype=np.float32).reshape(z, 1, 1) * img
         name = os.path.join(self.test_output, 'test_img_stack_10x9x5_mode2_native.mrc')
 
@@ -623,7 +659,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
         # Re-read data and check header and data values
         with self.newmrc(name) as mrc:
-            np.testing.assert_array_equal(mrc.data, stack)
+            helpers.assert_array_bytes_equal(stack, mrc.data)
             assert mrc.is_image_stack()
             assert mrc.header.ispg == IMAGE_STACK_SPACEGROUP
             assert mrc.header.nx == mrc.header.mx == x
@@ -633,7 +669,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
     def test_writing_volume_mode_1_native_byte_order(self):
         x, y, z = 10, 9, 5
-        img = np.linspace(-32768, 32767, x * y, dtype=np.int16).reshape(y, x)
+        img = INT16_IMAGE
         vol = img // np.arange(1, 6, dtype=np.int16).reshape(z, 1, 1)
         name = os.path.join(self.test_output, 'test_vol_10x9x5_mode1_native.mrc')
 
@@ -643,7 +679,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
         # Re-read data and check header and data values
         with self.newmrc(name) as mrc:
-            np.testing.assert_array_equal(mrc.data, vol)
+            helpers.assert_array_bytes_equal(vol, mrc.data)
             assert mrc.header.ispg == VOLUME_SPACEGROUP
             assert mrc.header.nx == mrc.header.mx == x
             assert mrc.header.ny == mrc.header.my == y
@@ -651,7 +687,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
     def test_writing_volume_stack_mode_1_native_byte_order(self):
         x, y, z, nvol = 10, 9, 5, 3
-        img = np.linspace(-32768, 32767, x * y, dtype=np.int16).reshape(y, x)
+        img = INT16_IMAGE
         vol = img // np.arange(1, 6, dtype=np.int16).reshape(z, 1, 1)
         stack = vol * np.array([-1, 0, 1], dtype=np.int16).reshape(nvol, 1, 1, 1)
         name = os.path.join(self.test_output, 'test_vol_stack_10x9x5x3_mode1_native.mrc')
@@ -662,7 +698,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
         # Re-read data and check header and data values
         with self.newmrc(name) as mrc:
-            np.testing.assert_array_equal(mrc.data, stack)
+            helpers.assert_array_bytes_equal(stack, mrc.data)
             assert mrc.header.ispg == VOLUME_STACK_SPACEGROUP
             assert mrc.header.nx == mrc.header.mx == x
             assert mrc.header.ny == mrc.header.my == y
@@ -673,7 +709,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
         # Quite unlikely that anyone will mess with the data array like this,
         # but still worth making sure the flush() call is robust!
         x, y, z = 10, 9, 5
-        img = np.linspace(-32768, 32767, x * y, dtype=np.int16).reshape(y, x)
+        img = INT16_IMAGE
         vol = img // np.arange(1, 6, dtype=np.int16).reshape(z, 1, 1)
         transposed_vol = vol.transpose()
 
@@ -701,7 +737,7 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
         # Quite unlikely that anyone will mess with the data array like this,
         # but still worth making sure the flush() call is robust!
         x, y, z = 10, 9, 5
-        img = np.linspace(-32768, 32767, x * y, dtype=np.int16).reshape(y, x)
+        img = INT16_IMAGE
         vol = img // np.arange(1, 6, dtype=np.int16).reshape(z, 1, 1)
         vol = vol.transpose()
 
@@ -713,12 +749,12 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
             assert mrc.data.flags.c_contiguous == True
 
     def test_permissive_read_with_wrong_machine_stamp(self):
-        data = np.arange(12, dtype=np.int16).reshape(3, 4)
+        data = INT16_3X4
         with self.newmrc(self.temp_mrc_name, mode='w+') as mrc:
             mrc.set_data(data)
             wrong_byte_order = mrc.header.mode.dtype.newbyteorder().byteorder
             mrc.header.machst = utils.machine_stamp_from_byte_order(wrong_byte_order)
-        with self.assertRaisesRegex(ValueError, "Unrecognised mode"):
+        with self.assertRaisesRegex(ValueError, UNRECOGNISED_MODE_RE):
             self.newmrc(self.temp_mrc_name)
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter("always")
@@ -731,24 +767,68 @@ class MrcFileTest(test_mrcobject.MrcObjectTest):
 
 
 
-def create_test_float32_array(dtype=np.float32):
+def calculate_stats(data):
+    """Calculate the min, max, mean, standard deviation and sum of an array.
+
+    The data is converted to float64 once and all the statistics are
+    calculated from that copy.
+    """
+    values = np.asarray(data, dtype=np.float64)
+    return (values.min(), values.max(), values.mean(), values.std(),
+            values.sum())
+
+
+def _make_test_float32_array():
     """Create a 10 x 9 array of float values.
 
     Values above 10^19 cause data.std(dtype=np.float32) to overflow, so we
     stay inside that range to avoid warnings."""
-    data = np.zeros((9, 10), dtype=dtype)
+    data = np.zeros((9, 10), dtype=np.float32)
     data[:4] = np.negative(np.logspace(19, -38, 40).reshape(4, 10))
     data[5:] = np.logspace(-38, 19, 40).reshape(4, 10)
     return data
 
 
-def create_test_complex64_array():
-    floats = create_test_float32_array()
+def _make_test_complex64_array(floats):
     data = 0.1j * floats[::-1]
     data += floats
     assert data.dtype.type == np.complex64
     return data
 
 
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+# The test arrays are only calculated once for each dtype. They are read-only,
+# and the functions below return new copies so tests are free to change them.
+_FLOAT32_TEST_ARRAYS = {
+    np.dtype(np.float32): _read_only(_make_test_float32_array())
+}
+_COMPLEX64_TEST_ARRAYS = {
+    np.dtype(np.complex64): _read_only(_make_test_complex64_array(
+        _FLOAT32_TEST_ARRAYS[np.dtype(np.float32)]))
+}
+
+
+def _get_cached_test_array(cache, dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in cache:
+        # All of the cached arrays hold the same values, so convert any of them
+        cache[dtype] = _read_only(next(iter(cache.values())).astype(dtype))
+    return cache[dtype].copy()
+
+
+def create_test_float32_array(dtype=np.float32):
+    """Return a new copy of the 10 x 9 float test array."""
+    return _get_cached_test_array(_FLOAT32_TEST_ARRAYS, dtype)
+
+
+def create_test_complex64_array(dtype=np.complex64):
+    """Return a new copy of the 10 x 9 complex test array."""
+    return _get_cached_test_array(_COMPLEX64_TEST_ARRAYS, dtype)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,12 @@ from mrcfile.constants import MAP_ID_OFFSET_BYTES
 from mrcfile.mrcinterpreter import MrcInterpreter
 
 
+# Small read-only array for the truncated stream tests. set_data() and
+# set_extended_header() only keep a reference to it, so it can be shared.
+INT16_1X3X4 = np.arange(12, dtype=np.int16).reshape(1, 3, 4)
+INT16_1X3X4.flags.writeable = False
+
+
 class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
     
     """Unit tests for MrcInterpreter class.
@@ -29,16 +35,14 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
     
     """
     
-    def setUp(self):
-        super(MrcInterpreterTest, self).setUp()
-        
-        # Set up parameters so MrcObject tests run on the MrcInterpreter class
-        self.mrcobject = MrcInterpreter()
-        self.mrcobject._create_default_attributes()
+    def create_prototype_mrcobject(self):
+        # Run the MrcObject tests on the MrcInterpreter class
+        mrcinterpreter = MrcInterpreter()
+        mrcinterpreter._create_default_attributes()
+        return mrcinterpreter
     
     def test_incorrect_map_id(self):
-        stream = io.BytesIO()
-        stream.write(bytearray(1024))
+        stream = io.BytesIO(b'\x00' * 1024)
         stream.seek(MAP_ID_OFFSET_BYTES)
         stream.write(b'map ')
         stream.seek(0)
@@ -46,8 +50,7 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
             MrcInterpreter(iostream=stream)
     
     def test_incorrect_machine_stamp(self):
-        stream = io.BytesIO()
-        stream.write(bytearray(1024))
+        stream = io.BytesIO(b'\x00' * 1024)
         stream.seek(MAP_ID_OFFSET_BYTES)
         stream.write(b'MAP ')
         stream.seek(0)
@@ -56,8 +59,7 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
             MrcInterpreter(iostream=stream)
     
     def test_stream_too_short(self):
-        stream = io.BytesIO()
-        stream.write(bytearray(1023))
+        stream = io.BytesIO(b'\x00' * 1023)
         with self.assertRaisesRegex(ValueError, "Couldn't read enough bytes for MRC header"):
             MrcInterpreter(iostream=stream)
     
@@ -99,8 +101,7 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
             assert len(w) == 0
     
     def test_permissive_read_mode_with_wrong_map_id_and_machine_stamp(self):
-        stream = io.BytesIO()
-        stream.write(bytearray(1024))
+        stream = io.BytesIO(b'\x00' * 1024)
         stream.seek(MAP_ID_OFFSET_BYTES)
         stream.write(b'map ')
         stream.seek(0)
@@ -118,10 +119,9 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
         mrc = MrcInterpreter()
         mrc._iostream = stream
         mrc._create_default_attributes()
-        mrc.set_extended_header(np.arange(12, dtype=np.int16).reshape(1, 3, 4))
+        mrc.set_extended_header(INT16_1X3X4)
         mrc.close()
-        stream.seek(-1, io.SEEK_CUR)
-        stream.truncate()
+        stream.truncate(stream.tell() - 1)
         stream.seek(0)
         
         with warnings.catch_warnings(record=True) as w:
@@ -138,10 +138,9 @@ class MrcInterpreterTest(test_mrcobject.MrcObjectTest):
         mrc = MrcInterpreter()
         mrc._iostream = stream
         mrc._create_default_attributes()
-        mrc.set_data(np.arange(12, dtype=np.int16).reshape(1, 3, 4))
+        mrc.set_data(INT16_1X3X4)
         mrc.close()
-        stream.seek(-1, io.SEEK_CUR)
-        stream.truncate()
+        stream.truncate(stream.tell() - 1)
         stream.seek(0)
 
         with warnings.catch_warnings(record=True) as w:
@@ -33,14 +33,15 @@ class MrcMemmapTest(test_mrcfile.MrcFileTest):
         
         # Set the newmrc method to the MrcMemmap constructor
         self.newmrc = MrcMemmap
-        
-        # Set up parameters so MrcObject tests run on the MrcMemmap class
+    
+    def create_mrcobject(self):
+        """Override to run the MrcObject tests on the MrcMemmap class."""
         obj_mrc_name = os.path.join(self.test_output, 'test_mrcobject.mrc')
-        self.mrcobject = MrcMemmap(obj_mrc_name, 'w+', overwrite=True)
+        return MrcMemmap(obj_mrc_name, 'w+')
     
     def test_repr(self):
         """Override test to change expected repr string."""
-        with MrcMemmap(self.example_mrc_name) as mrc:
+        with MrcMemmap(self.example_mrc_name, header_only=True) as mrc:
             assert repr(mrc) == "MrcMemmap('{0}', mode='r')".format(self.example_mrc_name)
     
     def test_exception_raised_if_file_is_too_small_for_reading_data(self):
@@ -10,7 +10,9 @@ Tests for mrcobject.py
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import copy
 import io
+import re
 import sys
 import unittest
 import warnings
@@ -33,10 +35,42 @@ from mrcfile.mrcobject import MrcObject
 from mrcfile import utils
 
 
+# Expected error messages, compiled once for use with assertRaisesRegex
+MRC_READ_ONLY_RE = re.compile('MRC object is read-only')
+READ_ONLY_RE = re.compile('read-only')
+
+# Small int16 arrays used by many of the data shape tests. set_data() and the
+# set_image_stack() / set_volume() methods never modify the data, so the
+# arrays are made read-only and shared between tests.
+INT16_2X3 = np.arange(6, dtype=np.int16).reshape(2, 3)
+INT16_2X3.flags.writeable = False
+INT16_2X2X3 = np.arange(12, dtype=np.int16).reshape(2, 2, 3)
+INT16_2X2X3.flags.writeable = False
+INT16_2X3X4 = np.arange(24, dtype=np.int16).reshape(2, 3, 4)
+INT16_2X3X4.flags.writeable = False
+INT16_2X2X2X3 = np.arange(24, dtype=np.int16).reshape(2, 2, 2, 3)
+INT16_2X2X2X3.flags.writeable = False
+
+# float32 array and a view of it with the opposite byte order, for the header
+# byte order tests
+FLOAT32_3X2 = np.arange(6, dtype=np.float32).reshape(3, 2)
+FLOAT32_3X2.flags.writeable = False
+FLOAT32_3X2_SWAPPED = FLOAT32_3X2.view(FLOAT32_3X2.dtype.newbyteorder())
+
+
 class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
     
     """Unit tests for MrcObject class"""
     
+    @classmethod
+    def setUpClass(cls):
+        super(MrcObjectTest, cls).setUpClass()
+        
+        # Building the default header is relatively slow, so it is only done
+        # once per class (by create_mrcobject(), the first time a test needs
+        # it) and each test gets its own deep copy
+        cls._prototype_mrcobject = None
+    
     def setUp(self):
         super(MrcObjectTest, self).setUp()
 
@@ -47,8 +81,36 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         warnings.simplefilter("error")
         self.addCleanup(warning_context.__exit__)
 
-        self.mrcobject = MrcObject()
-        self.mrcobject._create_default_attributes()
+        # The object under test is only created (by the mrcobject property)
+        # if a test actually uses it
+        self._mrcobject = None
+    
+    @property
+    def mrcobject(self):
+        if self._mrcobject is None:
+            self._mrcobject = self.create_mrcobject()
+        return self._mrcobject
+    
+    @mrcobject.setter
+    def mrcobject(self, value):
+        self._mrcobject = value
+    
+    def create_mrcobject(self):
+        """Create the object to be used by the tests.
+        
+        Subclasses can override this to run the tests on another MrcObject
+        type.
+        """
+        cls = type(self)
+        if cls._prototype_mrcobject is None:
+            cls._prototype_mrcobject = self.create_prototype_mrcobject()
+        return copy.deepcopy(cls._prototype_mrcobject)
+    
+    def create_prototype_mrcobject(self):
+        """Create the object which create_mrcobject() copies for each test."""
+        mrcobject = MrcObject()
+        mrcobject._create_default_attributes()
+        return mrcobject
     
     def test_attributes_are_empty_after_init(self):
         mrcobject = MrcObject()
@@ -60,7 +122,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert not self.mrcobject._read_only
         self.mrcobject._check_writeable()  # should not throw
         self.mrcobject._read_only = True
-        with self.assertRaisesRegex(ValueError, 'MRC object is read-only'):
+        with self.assertRaisesRegex(ValueError, MRC_READ_ONLY_RE):
             self.mrcobject._check_writeable()
     
     def test_calling_setters_raises_exception_if_read_only(self):
@@ -68,7 +130,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         self.mrcobject._read_only = True
         
         def assert_read_only(setter, *args):
-            with self.assertRaisesRegex(ValueError, 'MRC object is read-only'):
+            with self.assertRaisesRegex(ValueError, MRC_READ_ONLY_RE):
                 setter(*args)
         
         assert_read_only(self.mrcobject.set_extended_header, None)
@@ -177,12 +239,12 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert header.nz == header.mz == 1
     
     def test_switching_2d_data_to_image_stack_raises_exception(self):
-        self.mrcobject.set_data(np.arange(6, dtype=np.int16).reshape(2, 3))
+        self.mrcobject.set_data(INT16_2X3)
         with self.assertRaises(ValueError):
             self.mrcobject.set_image_stack()
     
     def test_switching_2d_data_to_volume_raises_exception(self):
-        self.mrcobject.set_data(np.arange(6, dtype=np.int16).reshape(2, 3))
+        self.mrcobject.set_data(INT16_2X3)
         with self.assertRaises(ValueError):
             self.mrcobject.set_volume()
     
@@ -198,7 +260,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert header.nz == header.mz == z
     
     def test_switching_volume_to_image_stack(self):
-        self.mrcobject.set_data(np.arange(12, dtype=np.int16).reshape(2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X3)
         assert self.mrcobject.is_volume()
         self.mrcobject.set_image_stack()
         assert self.mrcobject.is_image_stack()
@@ -207,13 +269,13 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert self.mrcobject.header.mz == 1
     
     def test_can_call_set_volume_when_already_a_volume(self):
-        self.mrcobject.set_data(np.arange(12, dtype=np.int16).reshape(2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X3)
         assert self.mrcobject.is_volume()
         self.mrcobject.set_volume()
         assert self.mrcobject.is_volume()
     
     def test_switching_image_stack_to_volume(self):
-        self.mrcobject.set_data(np.arange(12, dtype=np.int16).reshape(2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X3)
         assert self.mrcobject.is_volume()
         self.mrcobject.set_image_stack()
         assert self.mrcobject.is_image_stack()
@@ -223,17 +285,17 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert self.mrcobject.header.nz == self.mrcobject.header.mz == 2
     
     def test_can_call_set_image_stack_when_already_an_image_stack(self):
-        self.mrcobject.set_data(np.arange(12, dtype=np.int16).reshape(2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X3)
         self.mrcobject.set_image_stack()
         assert self.mrcobject.is_image_stack()
         self.mrcobject.set_image_stack()
         assert self.mrcobject.is_image_stack()
     
     def test_image_stack_with_new_3d_data_is_still_image_stack(self):
-        self.mrcobject.set_data(np.arange(12, dtype=np.int16).reshape(2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X3)
         self.mrcobject.set_image_stack()
         assert self.mrcobject.is_image_stack()
-        self.mrcobject.set_data(np.arange(24, dtype=np.int16).reshape(2, 3, 4))
+        self.mrcobject.set_data(INT16_2X3X4)
         assert self.mrcobject.is_image_stack()
     
     def test_header_is_correct_for_4d_data(self):
@@ -258,30 +320,25 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         self.mrcobject.header.ispg = spacegroup
         assert self.mrcobject.is_volume_stack()
         
-        self.mrcobject.set_data(vstack.copy().reshape(x, z, y, nvol))
+        self.mrcobject.set_data(vstack.reshape(x, z, y, nvol))
         assert self.mrcobject.is_volume_stack()
         assert self.mrcobject.header.ispg == spacegroup
     
     def test_switching_4d_data_to_image_stack_raises_exception(self):
-        self.mrcobject.set_data(np.arange(24, dtype=np.int16)
-                                .reshape(2, 2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X2X3)
         with self.assertRaises(ValueError):
             self.mrcobject.set_image_stack()
     
     def test_switching_4d_data_to_volume_raises_exception(self):
-        self.mrcobject.set_data(np.arange(24, dtype=np.int16)
-                                .reshape(2, 2, 2, 3))
+        self.mrcobject.set_data(INT16_2X2X2X3)
         with self.assertRaises(ValueError):
             self.mrcobject.set_volume()
     
-    def test_1d_data_raises_exception(self):
-        with self.assertRaises(ValueError):
-            self.mrcobject.set_data(np.arange(2, dtype=np.int16))
-    
-    def test_5d_data_raises_exception(self):
-        with self.assertRaises(ValueError):
-            self.mrcobject.set_data(np.arange(2, dtype=np.int16)
-                                    .reshape(1, 1, 1, 1, 2))
+    def test_1d_and_5d_data_raise_exception(self):
+        data = np.arange(2, dtype=np.int16)
+        for shape in [(2,), (1, 1, 1, 1, 2)]:
+            with self.assertRaises(ValueError):
+                self.mrcobject.set_data(data.reshape(shape))
     
     @unittest.skipIf(sys.maxsize <= np.iinfo(np.int32).max, "can't run test on 32-bit")
     def test_data_array_too_big_raises_exception(self):
@@ -289,66 +346,27 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "data array is too large"):
             self.mrcobject.set_data(data)
     
-    def assert_dtype_raises_exception(self, data):
-        with self.assertRaisesRegex(ValueError, 'dtype'):
-            self.mrcobject.set_data(data)
-    
-    def test_complex256_dtype_raises_exception(self):
+    def test_unsupported_dtypes_raise_exception(self):
+        dtypes = [np.complex128, np.float64, np.int32]
         # complex256 only exists on some platforms
         if hasattr(np, 'complex256'):
-            data = np.arange(6, dtype=np.complex256).reshape(3, 2)
-            self.assert_dtype_raises_exception(data)
+            dtypes.append(np.complex256)
+        for dtype in dtypes:
+            data = np.arange(6, dtype=dtype).reshape(3, 2)
+            with self.assertRaisesRegex(ValueError, 'dtype'):
+                self.mrcobject.set_data(data)
     
-    def test_complex128_dtype_raises_exception(self):
-        data = np.arange(6, dtype=np.complex128).reshape(3, 2)
-        self.assert_dtype_raises_exception(data)
-    
-    def test_float64_dtype_raises_exception(self):
-        data = np.arange(6, dtype=np.float64).reshape(3, 2)
-        self.assert_dtype_raises_exception(data)
-    
-    def test_int32_dtype_raises_exception(self):
-        data = np.arange(6, dtype=np.int32).reshape(3, 2)
-        self.assert_dtype_raises_exception(data)
-    
-    def test_int8_dtype_is_preserved_in_mode_0(self):
-        data = np.arange(6, dtype=np.int8).reshape(3, 2)
-        self.mrcobject.set_data(data)
-        assert self.mrcobject.data.dtype == np.int8
-        assert self.mrcobject.header.mode == 0
-    
-    def test_int16_dtype_is_preserved_in_mode_1(self):
-        data = np.arange(6, dtype=np.int16).reshape(3, 2)
-        self.mrcobject.set_data(data)
-        assert self.mrcobject.data.dtype == np.int16
-        assert self.mrcobject.header.mode == 1
-    
-    def test_float32_dtype_is_preserved_in_mode_2(self):
-        data = np.arange(6, dtype=np.float32).reshape(3, 2)
-        self.mrcobject.set_data(data)
-        assert self.mrcobject.data.dtype == np.float32
-        assert self.mrcobject.header.mode == 2
-    
-    def test_complex64_dtype_is_preserved_in_mode_4(self):
-        data = np.arange(6, dtype=np.complex64).reshape(3, 2)
+    def test_supported_dtypes_are_preserved_in_correct_modes(self):
         # Suppress complex casting warnings from statistics calculations
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", ComplexWarning)
-            self.mrcobject.set_data(data)
-            assert self.mrcobject.data.dtype == np.complex64
-            assert self.mrcobject.header.mode == 4
-    
-    def test_uint16_dtype_is_preserved_in_mode_6(self):
-        data = np.arange(6, dtype=np.uint16).reshape(3, 2)
-        self.mrcobject.set_data(data)
-        assert self.mrcobject.data.dtype == np.uint16
-        assert self.mrcobject.header.mode == 6
-    
-    def test_float16_dtype_is_preserved_in_mode_12(self):
-        data = np.arange(6, dtype=np.float16).reshape(3, 2)
-        self.mrcobject.set_data(data)
-        assert self.mrcobject.data.dtype == np.float16
-        assert self.mrcobject.header.mode == 12
+            for mode, dtype in [(0, np.int8), (1, np.int16), (2, np.float32),
+                                (4, np.complex64), (6, np.uint16),
+                                (12, np.float16)]:
+                data = np.arange(6, dtype=dtype).reshape(3, 2)
+                self.mrcobject.set_data(data)
+                assert self.mrcobject.data.dtype == dtype
+                assert self.mrcobject.header.mode == mode
     
     def test_uint8_dtype_is_widened_in_mode_6(self):
         data = np.arange(6, dtype=np.uint8).reshape(3, 2)
@@ -362,7 +380,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert self.mrcobject.data is data
     
     def test_header_byte_order_is_unchanged_by_data_with_native_order(self):
-        data = np.arange(6, dtype=np.float32).reshape(3, 2)
+        data = FLOAT32_3X2
         header = self.mrcobject.header
         original_mapc = int(header.mapc)
         assert utils.byte_orders_equal(header.mode.dtype.byteorder,
@@ -384,14 +402,14 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert header.mapc == original_mapc
     
     def test_header_byte_order_is_changed_by_data_with_opposite_order(self):
-        data = np.arange(6, dtype=np.float32).reshape(3, 2)
+        data = FLOAT32_3X2
         orig_byte_order = data.dtype.byteorder
         header = self.mrcobject.header
         original_mapc = int(header.mapc)
         assert utils.byte_orders_equal(header.mode.dtype.byteorder,
                                        orig_byte_order)
         
-        self.mrcobject.set_data(data.view(data.dtype.newbyteorder()))
+        self.mrcobject.set_data(FLOAT32_3X2_SWAPPED)
         assert not utils.byte_orders_equal(header.mode.dtype.byteorder,
                                            orig_byte_order)
         assert header.mode == 2
@@ -547,7 +565,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert voxel_size.y == 0.0
         assert voxel_size.z == 0.0
         assert not voxel_size.flags.writeable
-        with self.assertRaisesRegex(ValueError, "read-only"):
+        with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
             voxel_size.x = 1.1
     
     def test_setting_voxel_size_as_single_number(self):
@@ -604,7 +622,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         
         voxel_size = mrcobject.voxel_size
 
-        with self.assertRaisesRegex(ValueError, "read-only"):
+        with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
             voxel_size.x = 1.1
 
         voxel_size.flags.writeable = True
@@ -622,11 +640,11 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert nstart.y == 0
         assert nstart.z == 0
         assert not nstart.flags.writeable
-        with self.assertRaisesRegex(ValueError, "read-only"):
+        with self.assertRaisesRegex(ValueError, READ_ONLY_RE):
             nstart.x = 1
 
     def test_setting_nstart_as_tuple(self):
-        x, y, z = 20, 20, 20
+        x, y, z = 4, 3, 2
         data = np.arange(x * y * z, dtype=np.int16).reshape(z, y, x)
 
         mrcobj = self.mrcobject
@@ -642,7 +660,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert mrcobj.header.nzstart == offsets[2]
 
     def test_setting_nstart_as_single_number(self):
-        x, y, z = 20, 20, 20
+        x, y, z = 4, 3, 2
         data = np.arange(x * y * z, dtype=np.int16).reshape(z, y, x)
 
         mrcobj = self.mrcobject
@@ -658,7 +676,7 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         assert mrcobj.header.nzstart == offset
 
     def test_setting_nstart_as_modified_array(self):
-        x, y, z = 20, 20, 20
+        x, y, z = 4, 3, 2
         data = np.arange(x * y * z, dtype=np.int16).reshape(z, y, x)
 
         mrcobj = self.mrcobject
@@ -711,13 +729,10 @@ class MrcObjectTest(AssertRaisesRegexMixin, unittest.TestCase):
         with self.assertRaises(IndexError):
             self.mrcobject.add_label('Test label')
 
-    def test_adding_non_ascii_label_raises_exception(self):
-        with self.assertRaisesRegex(ValueError, "non-printable or non-ASCII"):
-            self.mrcobject.add_label('Test label £')
-
-    def test_adding_non_printable_label_raises_exception(self):
-        with self.assertRaisesRegex(ValueError, "non-printable or non-ASCII"):
-            self.mrcobject.add_label('Test label \n\x00')
+    def test_adding_non_ascii_or_non_printable_label_raises_exception(self):
+        for label in ['Test label £', 'Test label \n\x00']:
+            with self.assertRaisesRegex(ValueError, "non-printable or non-ASCII"):
+                self.mrcobject.add_label(label)
     
     def test_print_header(self):
         print_stream = io.StringIO()
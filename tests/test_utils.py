@@ -13,6 +13,7 @@ Tests for utils.py
 # and non-unicode literals.
 from __future__ import absolute_import, division, print_function
 
+import re
 import sys
 import unittest
 
@@ -23,6 +24,14 @@ from .helpers import AssertRaisesRegexMixin
 from mrcfile.dtypes import HEADER_DTYPE
 
 
+# Expected error message, compiled once for use with assertRaisesRegex
+UNRECOGNISED_BYTE_ORDER_RE = re.compile("Unrecognised byte order indicator")
+
+# Expected machine stamps for each byte order
+LITTLE_ENDIAN_MACHINE_STAMP = b'\x44\x44\x00\x00'
+BIG_ENDIAN_MACHINE_STAMP = b'\x11\x11\x00\x00'
+
+
 class UtilsTest(AssertRaisesRegexMixin, unittest.TestCase):
     
     """Unit tests for mrcfile.utils"""
@@ -30,33 +39,21 @@ class UtilsTest(AssertRaisesRegexMixin, unittest.TestCase):
     def test_header_dtype_is_correct_length(self):
         assert HEADER_DTYPE.itemsize == 1024
     
-    def test_mode_0_is_converted_to_int8(self):
-        dtype = utils.dtype_from_mode(0)
-        assert dtype == np.dtype(np.int8)
-    
-    def test_mode_1_is_converted_to_int16(self):
-        dtype = utils.dtype_from_mode(1)
-        assert dtype == np.dtype(np.int16)
-    
-    def test_mode_2_is_converted_to_float32(self):
-        dtype = utils.dtype_from_mode(2)
-        assert dtype == np.dtype(np.float32)
-    
-    def test_mode_3_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.dtype_from_mode(3)
-    
-    def test_mode_4_is_converted_to_complex64(self):
-        dtype = utils.dtype_from_mode(4)
-        assert dtype == np.dtype(np.complex64)
-    
-    def test_mode_6_is_converted_to_uint16(self):
-        dtype = utils.dtype_from_mode(6)
-        assert dtype == np.dtype(np.uint16)
+    def test_defined_modes_and_dtypes_are_converted_both_ways(self):
+        for mode, dtype in [(0, np.int8), (1, np.int16), (2, np.float32),
+                            (4, np.complex64), (6, np.uint16),
+                            (12, np.float16)]:
+            assert utils.dtype_from_mode(mode) == np.dtype(dtype)
+            assert utils.mode_from_dtype(np.dtype(dtype)) == mode
+        # The mode does not depend on the dtype's byte order
+        for mode, dtype in [(0, '|i1'), (1, '<i2'), (1, '>i2'), (2, '<f4'),
+                            (2, '>f4'), (4, '<c8'), (4, '>c8'), (6, '<u2'),
+                            (6, '>u2'), (12, '<f2'), (12, '>f2')]:
+            assert utils.mode_from_dtype(np.dtype(dtype)) == mode
     
     def test_undefined_modes_raise_exception(self):
         for mode in (x for x in range(-33, 34, 1) if x not in [0, 1, 2, 4, 6, 12]):
-            with self.assertRaises(ValueError):
+            with self.assertRaises(ValueError, msg='mode {0}'.format(mode)):
                 utils.dtype_from_mode(mode)
     
     def test_mode_scalar_is_converted_without_error(self):
@@ -79,91 +76,27 @@ class UtilsTest(AssertRaisesRegexMixin, unittest.TestCase):
         with self.assertRaises(ValueError):
             utils.dtype_from_mode(np.array([1, 2]))
     
-    def test_float16_dtype_is_converted_to_mode_12(self):
-        mode = utils.mode_from_dtype(np.dtype(np.float16))
-        assert mode == 12
-    
-    def test_float32_dtype_is_converted_to_mode_2(self):
-        mode = utils.mode_from_dtype(np.dtype(np.float32))
-        assert mode == 2
-    
-    def test_float64_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.float64))
-    
-    def test_float128_dtype_raises_exception(self):
+    def test_unsupported_dtypes_raise_exception(self):
+        dtypes = [np.float64, np.int32, np.int64, np.uint32, np.uint64,
+                  np.complex128, 'S1', 'U1', bool, object, [('f1', np.int32)]]
         # float128 only exists on some platforms
         if hasattr(np, 'float128'):
+            dtypes.append(np.float128)
+        for dtype in dtypes:
             with self.assertRaises(ValueError):
-                utils.mode_from_dtype(np.dtype(np.float128))
-    
-    def test_int8_dtype_is_converted_to_mode_0(self):
-        mode = utils.mode_from_dtype(np.dtype(np.int8))
-        assert mode == 0
-    
-    def test_int16_dtype_is_converted_to_mode_1(self):
-        mode = utils.mode_from_dtype(np.dtype(np.int16))
-        assert mode == 1
-    
-    def test_int32_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.int32))
-    
-    def test_int64_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.int64))
+                utils.mode_from_dtype(np.dtype(dtype))
     
     def test_uint8_dtype_is_converted_to_mode_6(self):
         mode = utils.mode_from_dtype(np.dtype(np.uint8))
         assert mode == 6
     
-    def test_uint16_dtype_is_converted_to_mode_6(self):
-        mode = utils.mode_from_dtype(np.dtype(np.uint16))
-        assert mode == 6
-    
-    def test_uint32_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.uint32))
-    
-    def test_uint64_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.uint64))
-    
-    def test_complex64_dtype_is_converted_to_mode_4(self):
-        mode = utils.mode_from_dtype(np.dtype(np.complex64))
-        assert mode == 4
-    
-    def test_complex128_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(np.complex128))
-    
-    def test_string_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype('S1'))
-    
-    def test_unicode_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype('U1'))
-    
-    def test_bool_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(bool))
-    
-    def test_object_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype(object))
-    
-    def test_structured_dtype_raises_exception(self):
-        with self.assertRaises(ValueError):
-            utils.mode_from_dtype(np.dtype([('f1', np.int32)]))
-    
     def test_little_endian_machine_stamp(self):
         machst = utils.machine_stamp_from_byte_order('<')
-        assert machst == bytearray((0x44, 0x44, 0x00, 0x00))
+        assert machst == LITTLE_ENDIAN_MACHINE_STAMP
     
     def test_big_endian_machine_stamp(self):
         machst = utils.machine_stamp_from_byte_order('>')
-        assert machst == bytearray((0x11, 0x11, 0x00, 0x00))
+        assert machst == BIG_ENDIAN_MACHINE_STAMP
     
     def test_native_machine_stamp(self):
         machst = utils.machine_stamp_from_byte_order()
@@ -186,10 +119,13 @@ class UtilsTest(AssertRaisesRegexMixin, unittest.TestCase):
     
     def test_normalise_unknown_byte_orders(self):
         for byte_order in ['|', 'I', 'other', 'S', 'N', 'L', 'B']:
-            with self.assertRaisesRegex(ValueError,
-                                        "Unrecognised byte order indicator"):
+            with self.assertRaisesRegex(ValueError, UNRECOGNISED_BYTE_ORDER_RE):
                 utils.normalise_byte_order(byte_order)
     
+    def test_normalise_unhashable_byte_order(self):
+        with self.assertRaisesRegex(ValueError, UNRECOGNISED_BYTE_ORDER_RE):
+            utils.normalise_byte_order(['<'])
+    
     def test_native_byte_orders_equal(self):
         assert utils.byte_orders_equal('=', '=')
     
@@ -216,12 +152,11 @@ class UtilsTest(AssertRaisesRegexMixin, unittest.TestCase):
                      ('>', '|'),
                      ('=', '|'),
                      ('|', '|')]:
-            with self.assertRaisesRegex(ValueError,
-                                        "Unrecognised byte order indicator"):
+            with self.assertRaisesRegex(ValueError, UNRECOGNISED_BYTE_ORDER_RE):
                 utils.byte_orders_equal(*pair)
     
     def test_unknown_byte_order_raises_exception(self):
-        with self.assertRaisesRegex(ValueError, "Unrecognised byte order indicator"):
+        with self.assertRaisesRegex(ValueError, UNRECOGNISED_BYTE_ORDER_RE):
             utils.machine_stamp_from_byte_order('|')
     
     def test_spacegroup_is_volume_stack(self):
@@ -10,9 +10,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os
-import shutil
 import sys
-import tempfile
 import unittest
 import warnings
 
@@ -32,18 +30,60 @@ from mrcfile.validator import validate_all
 from . import helpers
 
 
+# Data for the header statistics tests. The expected values are calculated
+# from this array in each test, and nothing modifies it, so it is read-only
+# and shared.
+STATS_TEST_DATA = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+STATS_TEST_DATA.flags.writeable = False
+
+# Data for files which should pass validation. It is only ever passed to
+# set_data(), so it is also read-only and shared.
+FLOAT32_3X3X4 = np.arange(36, dtype=np.float32).reshape(3, 3, 4)
+FLOAT32_3X3X4.flags.writeable = False
+
+
 class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
     
     """Unit tests for MRC validation functions.
     
     """
     
+    @classmethod
+    def setUpClass(cls):
+        super(ValidationTest, cls).setUpClass()
+        
+        # The validate_all() tests only read their good files, so create them
+        # once for the whole class rather than once per test
+        test_data = helpers.get_test_data_path()
+        cls.good_files_output = helpers.make_temp_dir()
+        good_mrc_name_1 = os.path.join(cls.good_files_output, 'good_file_1.mrc')
+        good_mrc_name_2 = os.path.join(cls.good_files_output, 'good_file_2.mrc')
+        
+        # Make good files which will pass validation
+        with mrcfile.new(good_mrc_name_1) as mrc:
+            mrc.set_data(FLOAT32_3X3X4)
+        
+        with mrcfile.new(good_mrc_name_2) as mrc:
+            mrc.set_data(np.arange(36, dtype=np.uint16).reshape(3, 3, 4))
+        
+        cls.good_files = [
+            good_mrc_name_1,
+            good_mrc_name_2,
+            os.path.join(test_data, 'fei-extended.mrc'),
+            os.path.join(test_data, 'epu2.9_example.mrc')
+        ]
+    
+    @classmethod
+    def tearDownClass(cls):
+        helpers.remove_temp_dir(cls.good_files_output)
+        super(ValidationTest, cls).tearDownClass()
+    
     def setUp(self):
         super(ValidationTest, self).setUp()
         
         # Set up test files and names to be used
         self.test_data = helpers.get_test_data_path()
-        self.test_output = tempfile.mkdtemp()
+        self.test_output = helpers.make_temp_dir()
         self.temp_mrc_name = os.path.join(self.test_output, 'test_mrcfile.mrc')
         self.example_mrc_name = os.path.join(self.test_data, 'EMD-3197.map')
         self.gzip_mrc_name = os.path.join(self.test_data, 'emd_3197.map.gz')
@@ -68,13 +108,12 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         sys.stderr = self.orig_stderr
         
         self.print_stream.close()
-        if os.path.exists(self.test_output):
-            shutil.rmtree(self.test_output)
+        helpers.remove_temp_dir(self.test_output)
         super(ValidationTest, self).tearDown()
     
     def test_good_file(self):
         with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.set_data(np.arange(36, dtype=np.float32).reshape(3, 3, 4))
+            mrc.set_data(FLOAT32_3X3X4)
             mrc.voxel_size = 2.3
         result = mrcfile.validate(self.temp_mrc_name, self.print_stream)
         assert result == True
@@ -193,64 +232,24 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
     
     def test_file_too_large(self):
         with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.set_data(np.arange(36, dtype=np.float32).reshape(3, 3, 4))
+            mrc.set_data(FLOAT32_3X3X4)
             mrc.header.nz = 2
         self.check_temp_mrc_invalid_with_warning("larger than expected")
         assert len(sys.stdout.getvalue()) == 0
         assert len(sys.stderr.getvalue()) == 0
     
-    def test_negative_mx(self):
-        with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.header.mx = -10
-        result = mrcfile.validate(self.temp_mrc_name,
-                                  print_file=self.print_stream)
-        assert result == False
-        print_output = self.print_stream.getvalue()
-        assert "Header field 'mx' is negative" in print_output
-        assert len(sys.stdout.getvalue()) == 0
-        assert len(sys.stderr.getvalue()) == 0
-    
-    def test_negative_my(self):
-        with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.header.my = -10
-        result = mrcfile.validate(self.temp_mrc_name,
-                                  print_file=self.print_stream)
-        assert result == False
-        print_output = self.print_stream.getvalue()
-        assert "Header field 'my' is negative" in print_output
-        assert len(sys.stdout.getvalue()) == 0
-        assert len(sys.stderr.getvalue()) == 0
-    
-    def test_negative_mz(self):
-        with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.header.mz = -10
-        result = mrcfile.validate(self.temp_mrc_name,
-                                  print_file=self.print_stream)
-        assert result == False
-        print_output = self.print_stream.getvalue()
-        assert "Header field 'mz' is negative" in print_output
-        assert len(sys.stdout.getvalue()) == 0
-        assert len(sys.stderr.getvalue()) == 0
-    
-    def test_negative_ispg(self):
-        with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.header.ispg = -10
-        result = mrcfile.validate(self.temp_mrc_name,
-                                  print_file=self.print_stream)
-        assert result == False
-        print_output = self.print_stream.getvalue()
-        assert "Header field 'ispg' is negative" in print_output
-        assert len(sys.stdout.getvalue()) == 0
-        assert len(sys.stderr.getvalue()) == 0
-    
-    def test_negative_nlabl(self):
-        with mrcfile.new(self.temp_mrc_name) as mrc:
-            mrc.header.nlabl = -3
-        result = mrcfile.validate(self.temp_mrc_name,
-                                  print_file=self.print_stream)
-        assert result == False
-        print_output = self.print_stream.getvalue()
-        assert "Header field 'nlabl' is negative" in print_output
+    def test_negative_header_fields(self):
+        for field, value in [('mx', -10), ('my', -10), ('mz', -10),
+                             ('ispg', -10), ('nlabl', -3)]:
+            with mrcfile.new(self.temp_mrc_name, overwrite=True) as mrc:
+                setattr(mrc.header, field, value)
+            print_stream = StringIO()
+            result = mrcfile.validate(self.temp_mrc_name,
+                                      print_file=print_stream)
+            assert result == False, field
+            print_output = print_stream.getvalue()
+            assert ("Header field '{0}' is negative".format(field)
+                    in print_output), field
         assert len(sys.stdout.getvalue()) == 0
         assert len(sys.stderr.getvalue()) == 0
     
@@ -386,7 +385,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_incorrect_rms(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.rms = 9.0
@@ -400,7 +399,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_rms_undetermined(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.rms = -15
@@ -411,7 +410,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_incorrect_dmin(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmin = -11
@@ -425,7 +424,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_incorrect_dmax(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmax = 15
@@ -439,7 +438,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_min_and_max_undetermined(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmin = 30.1
@@ -451,7 +450,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_incorrect_dmean(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmean = -2.5
@@ -466,7 +465,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_incorrect_dmean_with_undetermined_dmin_and_dmax(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmin = 20
@@ -483,7 +482,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_mean_undetermined(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmean = -11
@@ -494,7 +493,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
     
     def test_min_max_and_mean_undetermined(self):
-        data = np.arange(-10, 20, dtype=np.float32).reshape(2, 3, 5)
+        data = STATS_TEST_DATA
         with mrcfile.new(self.temp_mrc_name) as mrc:
             mrc.set_data(data)
             mrc.header.dmin = 30.1
@@ -534,27 +533,8 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stdout.getvalue()) == 0
         assert len(sys.stderr.getvalue()) == 0
     
-    def create_good_files(self):
-        """Create some files known to be valid and return their names."""
-        good_mrc_name_1 = os.path.join(self.test_output, 'good_file_1.mrc')
-        good_mrc_name_2 = os.path.join(self.test_output, 'good_file_2.mrc')
-        
-        # Make good files which will pass validation
-        with mrcfile.new(good_mrc_name_1) as mrc:
-            mrc.set_data(np.arange(36, dtype=np.float32).reshape(3, 3, 4))
-        
-        with mrcfile.new(good_mrc_name_2) as mrc:
-            mrc.set_data(np.arange(36, dtype=np.uint16).reshape(3, 3, 4))
-        
-        return [
-            good_mrc_name_1,
-            good_mrc_name_2,
-            self.fei1_ext_header_mrc_name,
-            self.fei2_ext_header_mrc_name
-        ]
-    
     def test_validate_good_files(self):
-        good_files = self.create_good_files()
+        good_files = self.good_files
         result = validate_all(good_files, print_file=self.print_stream)
         assert result == True
         print_output = self.print_stream.getvalue()
@@ -591,7 +571,7 @@ class ValidationTest(helpers.AssertRaisesRegexMixin, unittest.TestCase):
         assert len(sys.stderr.getvalue()) == 0
      
     def test_validate_good_and_bad_files(self):
-        files = self.create_good_files() + [
+        files = self.good_files + [
             self.not_an_mrc_name,
             self.example_mrc_name,
             self.ext_header_mrc_name,